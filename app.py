@@ -1,16 +1,111 @@
 import gradio as gr
 
+from src.agents.events import (
+    FinalReport,
+    PartialReport,
+    ResearchEvent,
+    SearchCompleted,
+    SearchStarted,
+    StageFinished,
+    StageStarted,
+)
 from src.agents.research_manager import ResearchManager
-from src.agents.writer_agent import ReportData
 
 # Initialize the research manager
 research_manager = ResearchManager()
 
 
+class ProgressView:
+    """Turns research events into Gradio updates, only touching what changed"""
+
+    def __init__(self):
+        self.stage_lines: list[str] = []
+        self.search_line = ""
+        self.searches_started = 0
+        self.findings: list[SearchCompleted] = []
+        self.has_draft = False
+
+    def status(self) -> str:
+        lines = self.stage_lines + ([self.search_line] if self.search_line else [])
+        return "\n".join(lines)
+
+    def render(self, event: ResearchEvent):
+        """Return (status, results_section, summary, insights, report) updates
+
+        Returns None when the event doesn't change anything on screen.
+        """
+        unchanged = gr.update()
+        if isinstance(event, StageStarted | StageFinished):
+            if isinstance(event, StageFinished) and event.stage == "searching":
+                # The stage message already includes the search count
+                self.search_line = ""
+            self.stage_lines.append(event.message)
+            return self.status(), unchanged, unchanged, unchanged, unchanged
+        if isinstance(event, SearchStarted):
+            self.searches_started += 1
+            self.search_line = (
+                f"🔎 Searches: {self.searches_started}/{event.total} started"
+            )
+            return self.status(), unchanged, unchanged, unchanged, unchanged
+        if isinstance(event, SearchCompleted):
+            running = self.searches_started - event.completed
+            self.search_line = (
+                f"🔎 Searches: {event.completed}/{event.total} completed, "
+                f"{max(running, 0)} running"
+            )
+            if event.summary is None or self.has_draft:
+                # Drafted report sections replace the raw findings once available
+                return self.status(), unchanged, unchanged, unchanged, unchanged
+            # Show each search summary as soon as it arrives
+            self.findings.append(event)
+            report = ResearchManager.format_findings(self.findings)
+            return self.status(), gr.update(visible=True), unchanged, unchanged, report
+        if isinstance(event, PartialReport):
+            self.has_draft = True
+            return (
+                unchanged,
+                gr.update(visible=True),
+                unchanged,
+                unchanged,
+                event.markdown,
+            )
+        if isinstance(event, FinalReport):
+            report = event.report
+            insights = "\n".join([f"• {insight}" for insight in report.key_insights])
+            if event.failed:
+                self.stage_lines.append("❌ Research failed: no search results found")
+            else:
+                self.stage_lines.append("✅ Research completed successfully!")
+            return (
+                self.status(),
+                gr.update(visible=True),
+                report.executive_summary,
+                insights,
+                report.markdown_report,
+            )
+        return None
+
+
+async def stream_research(
+    query: str,
+    questions: list[str] | None = None,
+    answers: list[str] | None = None,
+):
+    """Run the research and yield incremental (status, results, summary, insights, report) updates"""
+    view = ProgressView()
+    try:
+        async for event in research_manager.run(query, questions, answers):
+            update = view.render(event)
+            if update is not None:
+                yield update
+    except Exception as e:
+        yield f"Error during research: {str(e)}", gr.update(visible=False), "", "", ""
+
+
 async def start_research(query: str):
     """Start the research process by first getting clarification questions"""
     if not query.strip():
-        return (
+        yield (
             [],
             gr.update(visible=False),
             gr.update(visible=False),
@@ -21,64 +116,15 @@ async def start_research(query: str):
             "",
             gr.update(visible=False),
         )
+        return
 
     try:
         print(f"Getting clarification questions for query: {query}")
         questions = await research_manager.get_clarification_questions(query)
         print(f"Got {len(questions)} questions: {questions}")
-
-        if questions:
-            return (
-                questions,
-                gr.update(visible=True),
-                gr.update(visible=True),
-                "Please answer the clarification questions below to improve your research results.",
-                gr.update(visible=False),
-                "",
-                "",
-                "",
-                gr.update(visible=False),
-            )
-        else:
-            print("No questions returned, proceeding with research...")
-            # If no questions, run research directly
-            progress_text = ""
-            async for update in research_manager.run(query):
-                if isinstance(update, ReportData):
-                    # Final report - return structured data
-                    summary = update.executive_summary
-                    insights = "\n".join(
-                        [f"• {insight}" for insight in update.key_insights]
-                    )
-                    report = update.markdown_report
-                    final_status = progress_text + "✅ Research completed successfully!"
-                    return (
-                        [],
-                        gr.update(visible=False),
-                        gr.update(visible=False),
-                        final_status,
-                        gr.update(visible=True),
-                        summary,
-                        insights,
-                        report,
-                        gr.update(visible=True),
-                    )
-                else:
-                    progress_text += f"{update}\n"
-            return (
-                [],
-                gr.update(visible=False),
-                gr.update(visible=False),
-                progress_text,
-                gr.update(visible=False),
-                "",
-                "",
-                "",
-                gr.update(visible=False),
-            )
     except Exception as e:
         print(f"Error getting questions: {e}")
-        return (
+        yield (
             [],
             gr.update(visible=False),
             gr.update(visible=False),
@@ -89,6 +135,37 @@ async def start_research(query: str):
             "",
             gr.update(visible=False),
         )
+        return
+
+    if questions:
+        yield (
+            questions,
+            gr.update(visible=True),
+            gr.update(visible=True),
+            "Please answer the clarification questions below to improve your research results.",
+            gr.update(visible=False),
+            "",
+            "",
+            "",
+            gr.update(visible=False),
+        )
+        return
+
+    print("No questions returned, proceeding with research...")
+    # If no questions, run research directly and stream its progress
+    async for status, results, summary, insights, report in stream_research(query):
+        yield (
+            [],
+            gr.update(visible=False),
+            gr.update(visible=False),
+            status,
+            results,
+            summary,
+            insights,
+            report,
+            gr.update(),
+        )
+    yield (gr.update(),) * 8 + (gr.update(visible=True),)
 
 
 async def run_research_with_answers(
@@ -108,27 +185,9 @@ async def run_research_with_answers(
     if len(questions) > 2:
         answers.append(answer3 if answer3 else "")
 
-    try:
-        # Use the unified run method with questions and answers
-        progress_text = ""
-        async for update in research_manager.run(query, questions, answers):
-            # Check if update is a ReportData object (final result)
-            if isinstance(update, ReportData):
-                # Final report - display all three components
-                summary = update.executive_summary
-                insights = "\n".join(
-                    [f"• {insight}" for insight in update.key_insights]
-                )
-                report = update.markdown_report
-
-                final_status = progress_text + "✅ Research completed successfully!"
-                yield final_status, gr.update(visible=True), summary, insights, report
-            else:
-                # Status update
-                progress_text += f"{update}\n"
-                yield progress_text, gr.update(visible=False), "", "", ""
-    except Exception as e:
-        yield f"Error during research: {str(e)}", gr.update(visible=False), "", "", ""
+    # Use the unified run method with questions and answers
+    async for update in stream_research(query, questions, answers):
+        yield update
 
 
 def clear_all():
@@ -169,37 +228,8 @@ async def rerun_research(
             yield result
     else:
         # If no questions, rerun direct research
-        progress_text = ""
-        try:
-            async for update in research_manager.run(query):
-                if isinstance(update, ReportData):
-                    # Final report - display all three components
-                    summary = update.executive_summary
-                    insights = "\n".join(
-                        [f"• {insight}" for insight in update.key_insights]
-                    )
-                    report = update.markdown_report
-
-                    final_status = progress_text + "✅ Research completed successfully!"
-                    yield (
-                        final_status,
-                        gr.update(visible=True),
-                        summary,
-                        insights,
-                        report,
-                    )
-                else:
-                    # Status update
-                    progress_text += f"{update}\n"
-                    yield progress_text, gr.update(visible=False), "", "", ""
-        except Exception as e:
-            yield (
-                f"Error during research: {str(e)}",
-                gr.update(visible=False),
-                "",
-                "",
-                "",
-            )
+        async for result in stream_research(query):
+            yield result
 
 
 # Create the Gradio interface
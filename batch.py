@@ -0,0 +1,259 @@
+"""Headless batch runner for research queries.
+
+Reads queries from a JSONL file (one object per line with a ``query`` field and
+an optional ``id``), runs them through a shared ``ResearchManager`` without
+clarification and appends each report to a JSONL output file as soon as it is
+finished. Queries already present in the output file are skipped, so an
+interrupted batch can simply be restarted.
+
+Usage:
+    uv run python batch.py queries.jsonl --output results.jsonl --markdown-dir reports
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+
+from src.agents.events import FinalReport
+from src.agents.research_manager import ResearchManager, summary_flight
+from src.agents.search_agent import search_breaker, search_flight
+from src.agents.writer_agent import ReportData
+from src.config import BATCH_WORKERS, INCREMENTAL_WRITER, MAX_CONCURRENT_SEARCHES
+from src.model.model import llm_flight
+from src.utils.cassette import RECORD, REPLAY, use_cassette
+
+
+def load_queries(path: Path) -> list[dict]:
+    """Load queries from a JSONL file, assigning a stable id when none is given"""
+    queries = []
+    with path.open(encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            query = entry.get("query", "").strip()
+            if not query:
+                print(f"Skipping line {line_number}: no query")
+                continue
+            query_id = str(
+                entry.get("id") or hashlib.sha1(query.encode()).hexdigest()[:12]
+            )
+            queries.append({"id": query_id, "query": query})
+    return queries
+
+
+def load_completed_ids(path: Path) -> set[str]:
+    """Return the ids of queries that already have a successful result"""
+    completed = set()
+    if not path.exists():
+        return completed
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from an interrupted run
+                continue
+            if not isinstance(entry, dict) or entry.get("id") is None:
+                continue
+            if entry.get("status") == "ok":
+                completed.add(str(entry["id"]))
+    return completed
+
+
+def markdown_filename(query_id: str) -> str:
+    """Turn a user supplied query id into a safe file name"""
+    safe_id = re.sub(r"[^\w.-]+", "_", query_id).strip("._") or "query"
+    if safe_id != query_id:
+        # Keep ids that only differ in unsafe characters apart
+        safe_id += "-" + hashlib.sha1(query_id.encode()).hexdigest()[:8]
+    return f"{safe_id}.md"
+
+
+async def research_one(research_manager: ResearchManager, query: str) -> ReportData:
+    """Run a single research query to completion and return its report"""
+    async for event in research_manager.run(query):
+        if isinstance(event, FinalReport):
+            if event.failed:
+                # Record as failed so the query is retried on the next run
+                raise RuntimeError("No search results, search backend unavailable")
+            return event.report
+    raise RuntimeError("Research finished without a report")
+
+
+async def run_batch(
+    queries: list[dict],
+    output_path: Path,
+    markdown_dir: Path | None,
+    workers: int,
+    research_manager: ResearchManager,
+) -> None:
+    """Run all queries with a pool of workers, writing results as they finish"""
+    queue: asyncio.Queue[dict] = asyncio.Queue()
+    for entry in queries:
+        queue.put_nowait(entry)
+
+    if markdown_dir is not None:
+        markdown_dir.mkdir(parents=True, exist_ok=True)
+
+    stats = {"ok": 0, "error": 0}
+    start = time.monotonic()
+
+    with output_path.open("a", encoding="utf-8") as output:
+
+        def write_result(result: dict) -> None:
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+
+        async def worker() -> None:
+            while True:
+                try:
+                    entry = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                query_start = time.monotonic()
+                try:
+                    report = await research_one(research_manager, entry["query"])
+                    # Write the markdown first so an "ok" result always has it
+                    if markdown_dir is not None:
+                        (markdown_dir / markdown_filename(entry["id"])).write_text(
+                            report.markdown_report, encoding="utf-8"
+                        )
+                except Exception as e:
+                    print(f"[{entry['id']}] Failed: {e}")
+                    stats["error"] += 1
+                    write_result({**entry, "status": "error", "error": str(e)})
+                    continue
+
+                elapsed = time.monotonic() - query_start
+                stats["ok"] += 1
+                write_result(
+                    {
+                        **entry,
+                        "status": "ok",
+                        "elapsed_seconds": round(elapsed, 2),
+                        "executive_summary": report.executive_summary,
+                        "key_insights": report.key_insights,
+                        "markdown_report": report.markdown_report,
+                    }
+                )
+                done = stats["ok"] + stats["error"]
+                print(f"[{entry['id']}] Done in {elapsed:.1f}s ({done}/{len(queries)})")
+
+        await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+    elapsed = time.monotonic() - start
+    per_hour = stats["ok"] / elapsed * 3600 if elapsed > 0 else 0.0
+    print(
+        f"Batch finished: {stats['ok']} succeeded, {stats['error']} failed "
+        f"in {elapsed:.1f}s ({per_hour:.1f} queries/hour)"
+    )
+    print(f"Search backend: {search_breaker.metrics()}")
+    print(
+        f"Coalesced calls: searches {search_flight.metrics()}, "
+        f"summaries {summary_flight.metrics()}, model {llm_flight.metrics()}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run research queries in batch")
+    parser.add_argument("input", type=Path, help="JSONL file with queries")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("results.jsonl"),
+        help="JSONL file the reports are appended to (also used for resuming)",
+    )
+    parser.add_argument(
+        "--markdown-dir",
+        type=Path,
+        default=None,
+        help="Optional directory to write one markdown report per query",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BATCH_WORKERS,
+        help="Number of research runs executed concurrently",
+    )
+    parser.add_argument(
+        "--max-searches",
+        type=int,
+        default=MAX_CONCURRENT_SEARCHES,
+        help="Maximum concurrent searches (and DuckDuckGo requests) shared by all workers",
+    )
+    parser.add_argument(
+        "--incremental-writer",
+        action="store_true",
+        default=INCREMENTAL_WRITER,
+        help="Draft report sections while searches are still running",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        type=Path,
+        default=None,
+        help="Record all model and search calls with their latency to a cassette",
+    )
+    cassette.add_argument(
+        "--replay",
+        type=Path,
+        default=None,
+        help="Replay model and search calls from a cassette instead of the network",
+    )
+    parser.add_argument(
+        "--replay-timing",
+        action="store_true",
+        help="Sleep for the recorded latency of each replayed call",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Speed-up factor for replayed timing, e.g. 2 halves every latency",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1000,
+        help="Number of search summaries cached and shared between queries",
+    )
+    args = parser.parse_args()
+
+    queries = load_queries(args.input)
+    completed = load_completed_ids(args.output)
+    pending = [entry for entry in queries if entry["id"] not in completed]
+    print(
+        f"Loaded {len(queries)} queries, {len(queries) - len(pending)} already done, "
+        f"{len(pending)} to run"
+    )
+
+    # The search backend's adaptive limit is process-wide, cap it as well
+    search_breaker.set_max_limit(args.max_searches)
+    research_manager = ResearchManager(
+        max_concurrent_searches=args.max_searches,
+        search_cache_size=args.cache_size,
+        incremental_writer=args.incremental_writer,
+    )
+    batch = run_batch(
+        pending, args.output, args.markdown_dir, args.workers, research_manager
+    )
+    if args.record is not None:
+        with use_cassette(args.record, RECORD):
+            asyncio.run(batch)
+    elif args.replay is not None:
+        with use_cassette(
+            args.replay, REPLAY, realtime=args.replay_timing, speed=args.replay_speed
+        ):
+            asyncio.run(batch)
+    else:
+        asyncio.run(batch)
+
+
+if __name__ == "__main__":
+    main()
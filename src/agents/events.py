@@ -0,0 +1,47 @@
+# typed progress events emitted by ResearchManager.run
+
+from pydantic import BaseModel, Field
+
+from src.agents.writer_agent import ReportData
+
+
+class ResearchEvent(BaseModel):
+    """Base class for all events yielded by a research run"""
+
+
+class StageStarted(ResearchEvent):
+    stage: str = Field(description="Name of the stage, e.g. 'planning'")
+    message: str = Field(description="Human readable status message")
+
+
+class StageFinished(ResearchEvent):
+    stage: str = Field(description="Name of the stage, e.g. 'planning'")
+    message: str = Field(description="Human readable status message")
+
+
+class SearchStarted(ResearchEvent):
+    index: int = Field(description="Position of the search in the plan")
+    total: int = Field(description="Number of searches in the plan")
+    query: str = Field(description="The search term")
+
+
+class SearchCompleted(ResearchEvent):
+    index: int = Field(description="Position of the search in the plan")
+    total: int = Field(description="Number of searches in the plan")
+    completed: int = Field(description="Number of searches finished so far")
+    query: str = Field(description="The search term")
+    summary: str | None = Field(
+        default=None, description="Summary of the results, None if the search failed"
+    )
+
+
+class PartialReport(ResearchEvent):
+    markdown: str = Field(description="Preliminary markdown shown until the report")
+
+
+class FinalReport(ResearchEvent):
+    report: ReportData = Field(description="The finished report")
+    failed: bool = Field(
+        default=False,
+        description="True if the report only explains why the research failed",
+    )
@@ -1,37 +1,231 @@
 import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
 
 from src.agents.clarification_agent import questions_agent
+from src.agents.events import (
+    FinalReport,
+    PartialReport,
+    ResearchEvent,
+    SearchCompleted,
+    SearchStarted,
+    StageFinished,
+    StageStarted,
+)
 from src.agents.planning_agent import WebSearchItem, WebSearchPlan, planner_agent
-from src.agents.search_agent import search_agent
-from src.agents.writer_agent import ReportData, writer_agent
+from src.agents.search_agent import search_agent, search_breaker
+from src.agents.writer_agent import (
+    ReportData,
+    ReportSection,
+    ReportSummary,
+    section_writer_agent,
+    summary_writer_agent,
+    writer_agent,
+)
+from src.config import INCREMENTAL_WRITER, WRITER_BATCH_SIZE
+from src.utils.single_flight import SingleFlight, normalize_key
+
+# Shared by all sessions so identical concurrent searches are summarized once
+summary_flight = SingleFlight()
 
 
 class ResearchManager:
+    def __init__(
+        self,
+        max_concurrent_searches: int | None = None,
+        search_cache_size: int = 0,
+        incremental_writer: bool = INCREMENTAL_WRITER,
+        writer_batch_size: int = WRITER_BATCH_SIZE,
+    ):
+        """Create a research manager.
+
+        When several runs share one manager (e.g. in batch mode), the search
+        limit and the search cache are shared between all of them. With
+        incremental_writer, report sections are drafted from batches of
+        writer_batch_size search results while the searches are still running.
+        """
+        self._incremental_writer = incremental_writer
+        self._writer_batch_size = max(1, writer_batch_size)
+        self._search_semaphore = (
+            asyncio.Semaphore(max_concurrent_searches)
+            if max_concurrent_searches
+            else None
+        )
+        self._search_cache_size = search_cache_size
+        self._search_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+
     async def run(
         self,
         query: str,
         questions: list[str] | None = None,
         answers: list[str] | None = None,
-    ):
-        """Run the deep research process with optional clarification questions and answers"""
+    ) -> AsyncIterator[ResearchEvent]:
+        """Run the deep research process with optional clarification questions and answers
+
+        Yields typed progress events and finishes with a FinalReport.
+        """
         print("Starting research...")
 
         # Use clarified query if questions and answers are provided
         if questions and answers:
+            yield StageStarted(
+                stage="clarification", message="Processing your answers..."
+            )
             clarified_query = await self.process_user_answers(query, questions, answers)
-            yield "Processing your answers..."
+            yield StageFinished(stage="clarification", message="Answers processed")
         else:
             clarified_query = query
-            yield "Starting research without clarification..."
 
+        yield StageStarted(stage="planning", message="Planning searches...")
         search_plan = await self.plan_searches(clarified_query)
-        yield "Searches planned, starting to search..."
-        search_results = await self.perform_searches(search_plan)
-        yield "Searches complete, writing report..."
+        yield StageFinished(
+            stage="planning",
+            message=f"{len(search_plan.searches)} searches planned, starting to search...",
+        )
+
+        yield StageStarted(stage="searching", message="Searching...")
+        if self._incremental_writer:
+            async for event in self.search_and_draft(query, search_plan):
+                yield event
+            return
+
+        findings: list[SearchCompleted] = []
+        async for event in self.iter_searches(search_plan):
+            if isinstance(event, SearchCompleted) and event.summary is not None:
+                findings.append(event)
+            yield event
+        # Use plan order, not completion order, so the writer prompt is the same
+        # on every run (completion order depends on network latency)
+        findings.sort(key=lambda finding: finding.index)
+        search_results = [finding.summary for finding in findings]
+        yield StageFinished(
+            stage="searching",
+            message=f"Searches complete ({len(search_results)} with results)",
+        )
+        yield PartialReport(markdown=self.format_findings(findings))
+
+        if not search_results:
+            # Don't let the writer invent a report from nothing
+            yield FinalReport(report=self.no_results_report(), failed=True)
+            return
+
+        yield StageStarted(stage="writing", message="Writing report...")
         report = await self.write_report(query, search_results)
-        yield "Report written, creating document..."
-        yield "Document created, research complete"
-        yield report
+        yield StageFinished(stage="writing", message="Report written")
+        yield FinalReport(report=report)
+
+    async def search_and_draft(
+        self, query: str, search_plan: WebSearchPlan
+    ) -> AsyncIterator[ResearchEvent]:
+        """Search and draft report sections from result batches as they arrive
+
+        Batches are fixed by position in the search plan, so every section gets
+        the same search results (in the same order) on every run. A section is
+        drafted as soon as all searches of its batch are complete. Finishes with
+        a short pass for the executive summary, key insights and conclusion.
+        """
+        total = len(search_plan.searches)
+        size = self._writer_batch_size
+        batches = [
+            list(range(start, min(start + size, total)))
+            for start in range(0, total, size)
+        ]
+        completed: dict[int, SearchCompleted] = {}
+        section_tasks: dict[int, asyncio.Task[ReportSection]] = {}
+        num_drafted = 0
+
+        def start_ready_batches() -> None:
+            """Start drafting every batch whose searches are all complete"""
+            for number, batch in enumerate(batches):
+                if number in section_tasks or any(i not in completed for i in batch):
+                    continue
+                findings = [
+                    completed[i] for i in batch if completed[i].summary is not None
+                ]
+                if findings:
+                    section_tasks[number] = asyncio.create_task(
+                        self.write_section(query, findings)
+                    )
+
+        def drafted_report() -> PartialReport | None:
+            """Return a partial report if new sections finished drafting"""
+            nonlocal num_drafted
+            done = [
+                section_tasks[number].result()
+                for number in sorted(section_tasks)
+                if section_tasks[number].done()
+            ]
+            if len(done) == num_drafted:
+                return None
+            num_drafted = len(done)
+            return PartialReport(markdown=self.format_sections(done))
+
+        try:
+            async for event in self.iter_searches(search_plan):
+                yield event
+                if isinstance(event, SearchCompleted):
+                    completed[event.index] = event
+                    start_ready_batches()
+                partial = drafted_report()
+                if partial is not None:
+                    yield partial
+            num_results = sum(
+                1 for event in completed.values() if event.summary is not None
+            )
+            yield StageFinished(
+                stage="searching",
+                message=f"Searches complete ({num_results} with results)",
+            )
+
+            if not section_tasks:
+                # Don't let the writer invent a report from nothing
+                yield FinalReport(report=self.no_results_report(), failed=True)
+                return
+
+            yield StageStarted(
+                stage="drafting", message="Drafting remaining sections..."
+            )
+            pending = [task for task in section_tasks.values() if not task.done()]
+            while pending:
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                partial = drafted_report()
+                if partial is not None:
+                    yield partial
+            yield StageFinished(
+                stage="drafting", message=f"{len(section_tasks)} sections drafted"
+            )
+        finally:
+            # Don't leave drafts running if the consumer stops early
+            for task in section_tasks.values():
+                task.cancel()
+
+        sections = [section_tasks[number].result() for number in sorted(section_tasks)]
+        yield StageStarted(
+            stage="writing", message="Writing executive summary and conclusion..."
+        )
+        summary = await self.write_summary(query, sections)
+        yield StageFinished(stage="writing", message="Report written")
+        yield FinalReport(
+            report=ReportData(
+                markdown_report=self.format_report(summary, sections),
+                executive_summary=summary.executive_summary,
+                key_insights=summary.key_insights,
+            )
+        )
+
+    def no_results_report(self) -> ReportData:
+        """Report returned when no search produced a result"""
+        return ReportData(
+            markdown_report=(
+                "No search results could be retrieved, the search backend "
+                f"may be rate limiting us (circuit {search_breaker.state}). "
+                "Please try again in a few minutes."
+            ),
+            executive_summary="No search results available",
+            key_insights=[],
+        )
 
     async def plan_searches(self, query: str) -> WebSearchPlan:
         """Plan the searches to perform for the query"""
@@ -65,23 +259,115 @@ class ResearchManager:
 
     async def perform_searches(self, search_plan: WebSearchPlan) -> list[str]:
         """Perform the searches to perform for the query"""
+        results = []
+        async for event in self.iter_searches(search_plan):
+            if isinstance(event, SearchCompleted) and event.summary is not None:
+                results.append(event.summary)
+        return results
+
+    async def iter_searches(
+        self, search_plan: WebSearchPlan
+    ) -> AsyncIterator[SearchStarted | SearchCompleted]:
+        """Perform the searches concurrently, yielding an event as each one starts and completes"""
         print("Searching...")
+        total = len(search_plan.searches)
+        events: asyncio.Queue[SearchStarted | SearchCompleted] = asyncio.Queue()
         num_completed = 0
+
+        async def tracked_search(index: int, item: WebSearchItem) -> None:
+            result = None
+            try:
+                result = await self.search(
+                    item,
+                    on_start=lambda: events.put_nowait(
+                        SearchStarted(index=index, total=total, query=item.query)
+                    ),
+                )
+            finally:
+                nonlocal num_completed
+                num_completed += 1
+                events.put_nowait(
+                    SearchCompleted(
+                        index=index,
+                        total=total,
+                        completed=num_completed,
+                        query=item.query,
+                        summary=result,
+                    )
+                )
+
         tasks = [
-            asyncio.create_task(self.search(item)) for item in search_plan.searches
+            asyncio.create_task(tracked_search(index, item))
+            for index, item in enumerate(search_plan.searches)
         ]
-        results = []
-        for task in asyncio.as_completed(tasks):
-            result = await task
-            if result is not None:
-                results.append(result)
-            num_completed += 1
-            print(f"Searching... {num_completed}/{len(tasks)} completed")
-        print("Finished searching")
-        return results
+        try:
+            completed = 0
+            while completed < total:
+                event = await events.get()
+                if isinstance(event, SearchCompleted):
+                    completed += 1
+                    print(f"Searching... {completed}/{total} completed")
+                yield event
+        finally:
+            # Don't leave searches running if the consumer stops early
+            for task in tasks:
+                task.cancel()
+        print(f"Finished searching, search backend: {search_breaker.metrics()}")
+
+    @staticmethod
+    def format_findings(findings: list[SearchCompleted]) -> str:
+        """Format completed search summaries as preliminary markdown"""
+        if not findings:
+            return "No search results available yet."
+        sections = [f"### {finding.query}\n{finding.summary}" for finding in findings]
+        return "## Preliminary findings\n\n" + "\n\n".join(sections)
+
+    async def search(
+        self, item: WebSearchItem, on_start: Callable[[], None] | None = None
+    ) -> str | None:
+        """Perform a search for the query, using the shared limit and cache
+
+        on_start is called once the search actually begins, i.e. after waiting
+        for the shared search limit or when joining an identical running search.
+        """
+        # The reason steers the summary, so a summary is only reused for the
+        # same term searched for the same reason
+        cache_key = (normalize_key(item.query), normalize_key(item.reason))
+        if cache_key in self._search_cache:
+            self._search_cache.move_to_end(cache_key)
+            if on_start is not None:
+                on_start()
+            return self._search_cache[cache_key]
+
+        # Join an identical search already running in any session. The
+        # DuckDuckGo request itself is shared on the search term alone.
+        if cache_key in summary_flight and on_start is not None:
+            on_start()
+        result = await summary_flight.do(
+            cache_key, lambda: self._limited_search(item, on_start)
+        )
 
-    async def search(self, item: WebSearchItem) -> str | None:
-        """Perform a search for the query"""
+        if result is not None and self._search_cache_size > 0:
+            self._search_cache[cache_key] = result
+            if len(self._search_cache) > self._search_cache_size:
+                self._search_cache.popitem(last=False)
+        return result
+
+    async def _limited_search(
+        self, item: WebSearchItem, on_start: Callable[[], None] | None
+    ) -> str | None:
+        """Run the search agent once a slot under the shared search limit is free"""
+        if self._search_semaphore is None:
+            if on_start is not None:
+                on_start()
+            return await self._run_search_agent(item)
+        async with self._search_semaphore:
+            if on_start is not None:
+                on_start()
+            return await self._run_search_agent(item)
+
+    async def _run_search_agent(self, item: WebSearchItem) -> str | None:
+        """Run the search agent for a single search item"""
         input_message = (
             f"Search term: {item.query}\nReason for searching: {item.reason}"
         )
@@ -95,7 +381,8 @@ class ResearchManager:
                 else:
                     return str(final_message)
             return None
-        except Exception:
+        except Exception as e:
+            print(f"Search failed for '{item.query}': {e}")
             return None
 
     async def write_report(self, query: str, search_results: list[str]) -> ReportData:
@@ -147,6 +434,87 @@ class ResearchManager:
             key_insights=[],
         )
 
+    async def write_section(
+        self, query: str, findings: list[SearchCompleted]
+    ) -> ReportSection:
+        """Draft one themed report section from a batch of search results"""
+        print(f"Drafting section from {len(findings)} search results...")
+        input_message = (
+            f"Original query: {query}\n"
+            f"Summarized search results:\n{self.format_findings(findings)}"
+        )
+        try:
+            result = await section_writer_agent.ainvoke(
+                {"messages": [("user", input_message)]}
+            )
+            if result and isinstance(result, dict) and "structured_response" in result:
+                structured_response = result["structured_response"]
+                if isinstance(structured_response, ReportSection):
+                    return structured_response
+                elif isinstance(structured_response, dict):
+                    return ReportSection(**structured_response)
+        except Exception as e:
+            print(f"Error drafting section: {e}")
+
+        # Fallback: keep the raw findings rather than losing them
+        return ReportSection(
+            title="Additional Findings",
+            markdown="\n\n".join(finding.summary for finding in findings),
+        )
+
+    async def write_summary(
+        self, query: str, sections: list[ReportSection]
+    ) -> ReportSummary:
+        """Write the executive summary, key insights and conclusion for the sections"""
+        print("Writing summary...")
+        input_message = (
+            f"Original query: {query}\n"
+            f"Report sections:\n{self.format_sections(sections)}"
+        )
+        try:
+            result = await summary_writer_agent.ainvoke(
+                {"messages": [("user", input_message)]}
+            )
+            if result and isinstance(result, dict) and "structured_response" in result:
+                structured_response = result["structured_response"]
+                if isinstance(structured_response, ReportSummary):
+                    return structured_response
+                elif isinstance(structured_response, dict):
+                    return ReportSummary(**structured_response)
+        except Exception as e:
+            print(f"Error writing summary: {e}")
+
+        return ReportSummary(
+            title=query,
+            executive_summary="No summary available",
+            key_insights=[],
+            conclusion="",
+        )
+
+    @staticmethod
+    def format_sections(sections: list[ReportSection]) -> str:
+        """Format drafted sections as markdown"""
+        return "\n\n".join(
+            f"## {section.title}\n\n{section.markdown}" for section in sections
+        )
+
+    @classmethod
+    def format_report(
+        cls, summary: ReportSummary, sections: list[ReportSection]
+    ) -> str:
+        """Assemble the final markdown report from the summary and the sections"""
+        parts = [
+            f"# {summary.title}",
+            f"## {summary.summary_heading}\n\n{summary.executive_summary}",
+            cls.format_sections(sections),
+        ]
+        if summary.key_insights:
+            insights = "\n".join(f"- {insight}" for insight in summary.key_insights)
+            parts.append(f"## {summary.insights_heading}\n\n{insights}")
+        if summary.conclusion:
+            parts.append(f"## {summary.conclusion_heading}\n\n{summary.conclusion}")
+        return "\n\n".join(parts)
+
     async def get_clarification_questions(self, query: str) -> list[str]:
         """Get clarification questions for the query"""
         print("Getting clarification questions...")
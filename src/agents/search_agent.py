@@ -1,9 +1,16 @@
 # search agent with langchain and langchain duckduck go search tool
 
+import asyncio
+
 from langchain_community.tools import DuckDuckGoSearchRun
-from langgraph.prebuilt import create_react_agent
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun
+from langgraph.prebuilt import ToolNode, create_react_agent
 
+from src.config import MAX_CONCURRENT_SEARCHES, SEARCH_LATENCY_TARGET
 from src.model.model import gemini_llm
+from src.utils.cassette import get_cassette
+from src.utils.circuit_breaker import AdaptiveCircuitBreaker
+from src.utils.single_flight import SingleFlight, normalize_key
 
 INSTRUCTIONS = (
     "You are a research assistant. Given a search term, you search the web for that term and "
@@ -13,8 +20,40 @@ INSTRUCTIONS = (
     "essence and ignore any fluff. Do not include any additional commentary other than the summary itself."
 )
 
-search = DuckDuckGoSearchRun()
-tools = [search]
+# Shared by every search in the process so all sessions back off together
+search_breaker = AdaptiveCircuitBreaker(
+    max_limit=MAX_CONCURRENT_SEARCHES, latency_target=SEARCH_LATENCY_TARGET
+)
+# Identical searches running at the same time share one DuckDuckGo request
+search_flight = SingleFlight()
+
+
+class GuardedDuckDuckGoSearchRun(DuckDuckGoSearchRun):
+    """DuckDuckGo search behind the shared circuit breaker and single-flight"""
+
+    async def _arun(
+        self,
+        query: str,
+        run_manager: AsyncCallbackManagerForToolRun | None = None,
+    ) -> str:
+        key = normalize_key(query)
+        cassette = get_cassette()
+
+        def upstream():
+            if cassette is None:
+                return asyncio.to_thread(self._run, query)
+            # Record or replay the request through the active cassette
+            return cassette.call(
+                "search", key, lambda: asyncio.to_thread(self._run, query)
+            )
+
+        return await search_flight.do(key, lambda: search_breaker.call(upstream))
+
+
+search = GuardedDuckDuckGoSearchRun()
+# Let search errors reach the research manager instead of having the model
+# summarize an error message as if it were a search result
+tools = ToolNode([search], handle_tool_errors=False)
 model = gemini_llm
 
 search_agent = create_react_agent(model, tools, prompt=INSTRUCTIONS)
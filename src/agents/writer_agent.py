@@ -44,3 +44,62 @@ tools = []
 writer_agent = create_react_agent(
     model, tools, prompt=INSTRUCTIONS, response_format=ReportData
 )
+
+# Incremental writer: themed sections are drafted from batches of search results
+# while searches are still running, then a short final pass adds the summary.
+
+SECTION_INSTRUCTIONS = (
+    "You are a professional senior research report writer drafting one section of a larger report. "
+    "Given an original query and a batch of summarized search results, write a single themed section "
+    "of 200-400 words that presents what these results contribute to answering the query. "
+    "Give the section a short, descriptive title. Do not write an executive summary, introduction or "
+    "conclusion, those are written separately. Use markdown for the body (bullet points, emphasis) but "
+    "do not repeat the title as a header.\n\n"
+    "IMPORTANT: Write the section in the same language as the original query. If you cannot determine "
+    "the language or if the language is not supported, write in English as a fallback."
+)
+
+SUMMARY_INSTRUCTIONS = (
+    "You are a professional senior research report writer finishing a report. Given an original query "
+    "and the drafted sections of the report, write the report title, a brief executive summary, "
+    "3-6 key insights and a short conclusion with recommendations if applicable. Do not rewrite the "
+    "sections.\n\n"
+    "IMPORTANT: Write everything, including the section headings, in the same language as the original "
+    "query. If you cannot determine the language or if the language is not supported, write in English "
+    "as a fallback."
+)
+
+
+class ReportSection(BaseModel):
+    title: str = Field(description="Short descriptive title of the section")
+    markdown: str = Field(description="Markdown body of the section, without title")
+
+
+class ReportSummary(BaseModel):
+    title: str = Field(description="Title of the report")
+    executive_summary: str = Field(description="Brief executive summary of the report")
+    key_insights: list[str] = Field(
+        description="List of key insights from the research"
+    )
+    conclusion: str = Field(description="Short conclusion of the report")
+    summary_heading: str = Field(
+        default="Executive Summary",
+        description="Heading for the executive summary, in the report language",
+    )
+    insights_heading: str = Field(
+        default="Key Insights",
+        description="Heading for the key insights, in the report language",
+    )
+    conclusion_heading: str = Field(
+        default="Conclusion",
+        description="Heading for the conclusion, in the report language",
+    )
+
+
+section_writer_agent = create_react_agent(
+    model, tools, prompt=SECTION_INSTRUCTIONS, response_format=ReportSection
+)
+
+summary_writer_agent = create_react_agent(
+    model, tools, prompt=SUMMARY_INSTRUCTIONS, response_format=ReportSummary
+)
@@ -12,3 +12,22 @@ if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY is not set")
 
 SEARCHES = int(os.getenv("SEARCHES", "20"))  # Default to 20 searches
+
+# Batch mode settings
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))  # Concurrent research runs
+
+# Search backend settings
+MAX_CONCURRENT_SEARCHES = int(
+    os.getenv("MAX_CONCURRENT_SEARCHES", "8")
+)  # Upper bound for concurrent searches shared across all runs
+SEARCH_LATENCY_TARGET = float(
+    os.getenv("SEARCH_LATENCY_TARGET", "10")
+)  # Searches slower than this (seconds) reduce search concurrency
+
+# Writer settings
+INCREMENTAL_WRITER = (
+    os.getenv("INCREMENTAL_WRITER", "false").lower() == "true"
+)  # Draft report sections while searches are still running
+WRITER_BATCH_SIZE = int(
+    os.getenv("WRITER_BATCH_SIZE", "5")
+)  # Search results per drafted section in incremental mode
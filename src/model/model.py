@@ -1,9 +1,93 @@
+import hashlib
+import json
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from src.config import GEMINI_API_KEY
+from src.utils.cassette import get_cassette
+from src.utils.single_flight import SingleFlight
+
+# Shared by all sessions so identical concurrent prompts hit the API once
+llm_flight = SingleFlight()
+
+
+def request_key(messages: list[BaseMessage], stop: list[str] | None, **kwargs) -> str:
+    """Build a coalescing key from everything that is sent to the model"""
+    payload = {
+        # Message ids are assigned per session and never sent to the model
+        "messages": [message.model_dump(exclude={"id"}) for message in messages],
+        "stop": stop,
+        "kwargs": kwargs,
+    }
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def encode_chat_result(result: ChatResult) -> dict:
+    """Convert a model response to JSON for the cassette"""
+    return {
+        "generations": [
+            {
+                "message": message_to_dict(generation.message),
+                "generation_info": generation.generation_info,
+            }
+            for generation in result.generations
+        ],
+        "llm_output": result.llm_output,
+    }
+
+
+def decode_chat_result(data: dict) -> ChatResult:
+    """Rebuild a model response recorded by encode_chat_result"""
+    generations = [
+        ChatGeneration(
+            message=messages_from_dict([generation["message"]])[0],
+            generation_info=generation["generation_info"],
+        )
+        for generation in data["generations"]
+    ]
+    return ChatResult(generations=generations, llm_output=data["llm_output"])
+
+
+class CoalescingChatGoogleGenerativeAI(ChatGoogleGenerativeAI):
+    """Gemini chat model that coalesces identical concurrent async requests
+
+    Requests are recorded to, or replayed from, the active cassette if any.
+    """
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs,
+    ) -> ChatResult:
+        key = request_key(messages, stop, **kwargs)
+        parent = super()
+
+        def upstream():
+            return parent._agenerate(messages, stop, run_manager, **kwargs)
+
+        cassette = get_cassette()
+        if cassette is None:
+            result = await llm_flight.do(key, upstream)
+        else:
+            result = await llm_flight.do(
+                key,
+                lambda: cassette.call(
+                    "llm", key, upstream, encode_chat_result, decode_chat_result
+                ),
+            )
+        # The caller sets message ids and metadata in place, so each coalesced
+        # caller needs its own copy of the shared result
+        return result.model_copy(deep=True)
+
 
 # Initialize gemini model
-gemini_llm = ChatGoogleGenerativeAI(
+gemini_llm = CoalescingChatGoogleGenerativeAI(
     model="gemini-2.5-flash",  # model name
     temperature=0.2,  # temperature for the model
     max_tokens=None,  # max tokens for the model
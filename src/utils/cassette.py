@@ -0,0 +1,139 @@
+# record/replay of model and search interactions for reproducible runs
+
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+RECORD = "record"
+REPLAY = "replay"
+
+_active_cassette: "Cassette | None" = None
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request was never recorded"""
+
+
+class CassetteReplayError(Exception):
+    """Re-raised in replay mode for a call that failed while recording"""
+
+
+class Cassette:
+    """Records upstream calls with their latency, or replays them from a file.
+
+    Interactions are matched on (kind, key) rather than on order, because
+    concurrent searches finish in a different order on every run. A key that
+    was recorded several times is replayed in recorded order; once exhausted
+    its last response is reused. Callers must build their requests (e.g. the
+    writer prompt) independently of completion order for the keys to match.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: str,
+        realtime: bool = False,
+        speed: float = 1.0,
+    ):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.realtime = realtime
+        self.speed = speed
+        self.interactions: list[dict[str, Any]] = []
+        self._replay: dict[tuple[str, str], deque[dict[str, Any]]] = defaultdict(deque)
+        self._last: dict[tuple[str, str], dict[str, Any]] = {}
+        if mode == REPLAY:
+            self._load()
+
+    def _load(self) -> None:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        self.interactions = data["interactions"]
+        for interaction in self.interactions:
+            self._replay[(interaction["kind"], interaction["key"])].append(interaction)
+
+    def save(self) -> None:
+        """Write the recorded interactions to the cassette file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": 1, "interactions": self.interactions}
+        self.path.write_text(
+            json.dumps(data, ensure_ascii=False, indent=1, default=str),
+            encoding="utf-8",
+        )
+
+    async def call(
+        self,
+        kind: str,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        encode: Callable[[T], Any] = lambda value: value,
+        decode: Callable[[Any], T] = lambda value: value,
+    ) -> T:
+        """Record fn's outcome, or return the recorded outcome in replay mode"""
+        if self.mode == REPLAY:
+            return await self._play(kind, key, decode)
+
+        start = time.monotonic()
+        try:
+            result = await fn()
+        except Exception as e:
+            self._append(kind, key, start, error=f"{type(e).__name__}: {e}")
+            raise
+        self._append(kind, key, start, response=encode(result))
+        return result
+
+    def _append(self, kind: str, key: str, start: float, **outcome: Any) -> None:
+        self.interactions.append(
+            {
+                "kind": kind,
+                "key": key,
+                "latency": round(time.monotonic() - start, 3),
+                **outcome,
+            }
+        )
+
+    async def _play(self, kind: str, key: str, decode: Callable[[Any], T]) -> T:
+        recorded = self._replay.get((kind, key))
+        if recorded:
+            interaction = recorded.popleft()
+            self._last[(kind, key)] = interaction
+        elif (kind, key) in self._last:
+            interaction = self._last[(kind, key)]
+        else:
+            raise CassetteMissError(f"No recorded {kind} call for key {key}")
+
+        if self.realtime:
+            await asyncio.sleep(interaction["latency"] / self.speed)
+        if "error" in interaction:
+            raise CassetteReplayError(interaction["error"])
+        return decode(interaction["response"])
+
+
+def get_cassette() -> Cassette | None:
+    """Return the cassette in use, if any"""
+    return _active_cassette
+
+
+@contextmanager
+def use_cassette(
+    path: str | Path, mode: str, realtime: bool = False, speed: float = 1.0
+) -> Iterator[Cassette]:
+    """Record or replay all model and search calls made inside the block"""
+    global _active_cassette
+    cassette = Cassette(path, mode, realtime=realtime, speed=speed)
+    _active_cassette = cassette
+    try:
+        yield cassette
+    finally:
+        _active_cassette = None
+        if mode == RECORD:
+            cassette.save()
+            print(f"Recorded {len(cassette.interactions)} interactions to {path}")
@@ -0,0 +1,269 @@
+# circuit breaker with AIMD adaptive concurrency for flaky backends
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an error looks like a rate-limit response from the backend"""
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in ("ratelimit", "rate limit", "429"))
+
+
+class AdaptiveCircuitBreaker:
+    """Circuit breaker that also adapts how many calls may run at once.
+
+    The concurrency limit follows AIMD: it grows by roughly one slot per
+    "round" of fast successful calls and is halved on failures or slow calls.
+    It shrinks at most once per congestion event: calls that started before
+    the last decrease were already part of that event and don't shrink it again.
+    A rate-limit error, or a high failure rate over the recent window, opens
+    the circuit. After a cooldown a single probe call is let through; if it
+    succeeds the circuit closes again and the limit restarts from the minimum,
+    otherwise the circuit reopens with a doubled cooldown.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        latency_target: float = 10.0,
+        failure_threshold: float = 0.5,
+        window: int = 10,
+        min_calls: int = 4,
+        cooldown: float = 5.0,
+        max_cooldown: float = 120.0,
+        max_wait: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_wait = max_wait
+        self._clock = clock
+
+        self.state = CLOSED
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._opened_at = 0.0
+        self._last_decrease = float("-inf")
+        self._probe_in_flight = False
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        # Callers waiting for a slot, woken whenever a slot or the state changes
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+        self.successes = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self.opens = 0
+        self.avg_latency: float | None = None
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn once a slot is available, recording its outcome
+
+        If the caller is cancelled, fn keeps running and holds its slot until
+        it finishes: work in a thread can't be cancelled, and the limit is on
+        requests to the backend, not on callers waiting for them.
+        """
+        is_probe = await self.acquire()
+        start = self._clock()
+        task = asyncio.ensure_future(fn())
+        task.add_done_callback(lambda done: self._finish_call(done, start, is_probe))
+        return await asyncio.shield(task)
+
+    def _finish_call(
+        self, task: asyncio.Future[object], start: float, is_probe: bool
+    ) -> None:
+        """Release the slot of a finished call and record its outcome"""
+        if task.cancelled():
+            self._release_slot(is_probe)
+            return
+        error = task.exception()
+        if error is None:
+            self.record_success(self._clock() - start, is_probe)
+        else:
+            self.record_failure(
+                self._clock() - start, is_probe, is_rate_limit_error(error)
+            )
+
+    async def acquire(self) -> bool:
+        """Wait for a slot, returning True if the call is the recovery probe
+
+        Raises CircuitOpenError if the circuit will not let the call through
+        within max_wait seconds.
+        """
+        deadline = self._clock() + self.max_wait
+        while True:
+            acquired = self._try_acquire()
+            if acquired is not None:
+                return acquired
+            now = self._clock()
+            if self.state == OPEN and self._opened_at + self.cooldown > deadline:
+                # No point waiting, the circuit stays open past our deadline
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"Circuit open, retrying in {self._opened_at + self.cooldown - now:.0f}s"
+                )
+            if self.state != CLOSED and now >= deadline:
+                self.rejected += 1
+                raise CircuitOpenError("Circuit did not recover in time")
+            if self.state == OPEN:
+                # Nothing is released while open, wake up when the cooldown ends
+                timeout = self._opened_at + self.cooldown - now
+            elif self.state == HALF_OPEN:
+                timeout = deadline - now
+            else:
+                timeout = None
+            await self._wait(timeout)
+
+    async def _wait(self, timeout: float | None) -> None:
+        """Wait until woken by _notify or until timeout seconds have passed"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            pass
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _notify(self) -> None:
+        """Wake all waiting callers so they can retry taking a slot"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def set_max_limit(self, max_limit: int) -> None:
+        """Change the upper bound of the concurrency limit"""
+        self.max_limit = max(max_limit, self.min_limit)
+        self.limit = min(self.limit, self.max_limit)
+        self._notify()
+
+    def _try_acquire(self) -> bool | None:
+        """Take a slot if possible; returns whether it is the probe, or None"""
+        if self.state == OPEN:
+            if self._clock() - self._opened_at < self.cooldown:
+                return None
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                return None
+            self._probe_in_flight = True
+            self.in_flight += 1
+            return True
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return False
+        return None
+
+    def _release_slot(self, is_probe: bool) -> None:
+        self.in_flight -= 1
+        if is_probe:
+            self._probe_in_flight = False
+        self._notify()
+
+    def _record_latency(self, latency: float) -> None:
+        if self.avg_latency is None:
+            self.avg_latency = latency
+        else:
+            self.avg_latency = 0.8 * self.avg_latency + 0.2 * latency
+
+    def record_success(self, latency: float, is_probe: bool = False) -> None:
+        """Record a successful call and grow (or shrink, if slow) the limit"""
+        self._release_slot(is_probe)
+        self.successes += 1
+        self._outcomes.append(True)
+        self._record_latency(latency)
+
+        if is_probe:
+            self.state = CLOSED
+            self.cooldown = self.base_cooldown
+            self.limit = float(self.min_limit)
+            self._outcomes.clear()
+            return
+
+        if latency > self.latency_target:
+            # Backend is slowing down, back off before it starts failing
+            self._decrease(latency, 0.75)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def record_failure(
+        self, latency: float, is_probe: bool = False, rate_limited: bool = False
+    ) -> None:
+        """Record a failed call, halve the limit and open the circuit if needed"""
+        self._release_slot(is_probe)
+        self.failures += 1
+        if rate_limited:
+            self.rate_limited += 1
+        self._outcomes.append(False)
+        self._record_latency(latency)
+        self._decrease(latency, 0.5)
+
+        if is_probe:
+            self._open(min(self.cooldown * 2, self.max_cooldown))
+        elif self.state == CLOSED and (
+            rate_limited or self._failure_rate() >= self.failure_threshold
+        ):
+            self._open(self.cooldown)
+
+    def _decrease(self, latency: float, factor: float) -> None:
+        """Shrink the limit unless the call started before the last decrease"""
+        now = self._clock()
+        if now - latency < self._last_decrease:
+            # Same congestion event as a call that already shrank the limit
+            return
+        self.limit = max(self.min_limit, self.limit * factor)
+        self._last_decrease = now
+
+    def _failure_rate(self) -> float:
+        if len(self._outcomes) < self.min_calls:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _open(self, cooldown: float) -> None:
+        self.state = OPEN
+        self.cooldown = cooldown
+        self._opened_at = self._clock()
+        self.opens += 1
+        print(f"Circuit opened for {cooldown:.0f}s")
+
+    def metrics(self) -> dict:
+        """Snapshot of the breaker state for logging and monitoring"""
+        return {
+            "state": self.state,
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+            "opens": self.opens,
+            "failure_rate": round(self._failure_rate(), 2),
+            "avg_latency_seconds": (
+                round(self.avg_latency, 2) if self.avg_latency is not None else None
+            ),
+        }
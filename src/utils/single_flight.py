@@ -0,0 +1,72 @@
+# single-flight coalescing of identical concurrent async calls
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_key(text: str) -> str:
+    """Normalize free text (e.g. a search term) for use as a coalescing key"""
+    return " ".join(text.lower().split())
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller for a key starts the call, everyone arriving while it is
+    still running awaits the same task and gets the same result (or error).
+    If every caller is cancelled the shared call is cancelled too. Nothing is
+    cached once the call has finished.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn for key, or join the call already running for it"""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        self._waiters[key] += 1
+        try:
+            # Shield so one caller being cancelled doesn't cancel the others
+            return await asyncio.shield(task)
+        finally:
+            if self._in_flight.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0 and not task.done():
+                    # Nobody is interested in the result any more; forget the
+                    # key right away so new callers don't join a dying task
+                    del self._in_flight[key]
+                    del self._waiters[key]
+                    task.cancel()
+
+    def _finish(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Mark the error as retrieved in case every caller was cancelled
+            task.exception()
+
+    def metrics(self) -> dict:
+        """Counts of upstream calls made and calls served by joining one"""
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,6 @@
+"""Shared pytest configuration."""
+
+import os
+
+# src.config requires an API key at import time; tests never call Gemini
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
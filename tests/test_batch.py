@@ -0,0 +1,84 @@
+"""Tests for the headless batch runner."""
+
+import asyncio
+import json
+
+import batch
+from src.agents.writer_agent import ReportData
+
+
+class FakeResearchManager:
+    """Stands in for ResearchManager; research_one is patched to use it."""
+
+
+def fake_report(research_manager, query):
+    async def report():
+        return ReportData(
+            markdown_report=f"# {query}", executive_summary="s", key_insights=[]
+        )
+
+    return report()
+
+
+def test_markdown_filename_is_safe():
+    """Ids are kept when safe and sanitized (but kept distinct) otherwise."""
+    assert batch.markdown_filename("acme-pricing_2") == "acme-pricing_2.md"
+    for unsafe in ("acme/pricing", "../x", "..", "a b"):
+        name = batch.markdown_filename(unsafe)
+        assert "/" not in name and not name.startswith(".")
+    assert batch.markdown_filename("a/b") != batch.markdown_filename("a_b")
+
+
+def test_load_completed_ids_skips_malformed_lines(tmp_path):
+    """Only well-formed successful results count as completed."""
+    path = tmp_path / "results.jsonl"
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps({"id": "a", "status": "ok"}),
+                json.dumps({"id": "b", "status": "error"}),
+                json.dumps(["not", "a", "dict"]),
+                json.dumps({"status": "ok"}),
+                '{"id": "c", "sta',
+            ]
+        )
+    )
+    assert batch.load_completed_ids(path) == {"a"}
+
+
+def test_unsafe_ids_are_written_inside_markdown_dir(tmp_path, monkeypatch):
+    """Ids with path separators neither abort the batch nor escape the dir."""
+    monkeypatch.setattr(batch, "research_one", fake_report)
+    output = tmp_path / "results.jsonl"
+    markdown_dir = tmp_path / "reports"
+    queries = [{"id": "acme/pricing", "query": "q1"}, {"id": "../x", "query": "q2"}]
+
+    asyncio.run(
+        batch.run_batch(queries, output, markdown_dir, 2, FakeResearchManager())
+    )
+
+    assert batch.load_completed_ids(output) == {"acme/pricing", "../x"}
+    assert len(list(markdown_dir.iterdir())) == 2
+    assert not (tmp_path / "x.md").exists()
+
+
+def test_failed_markdown_write_is_recorded_as_error(tmp_path, monkeypatch):
+    """A query whose markdown can't be written is retried on the next run."""
+    monkeypatch.setattr(batch, "research_one", fake_report)
+    output = tmp_path / "results.jsonl"
+    markdown_dir = tmp_path / "reports"
+    markdown_dir.mkdir()
+    # A directory where the markdown file should go makes the write fail
+    (markdown_dir / "a.md").mkdir()
+
+    asyncio.run(
+        batch.run_batch(
+            [{"id": "a", "query": "q1"}, {"id": "b", "query": "q2"}],
+            output,
+            markdown_dir,
+            1,
+            FakeResearchManager(),
+        )
+    )
+
+    assert batch.load_completed_ids(output) == {"b"}
@@ -0,0 +1,99 @@
+"""Tests for recording and replaying upstream calls."""
+
+import asyncio
+
+import pytest
+
+from src.utils.cassette import (
+    RECORD,
+    REPLAY,
+    CassetteMissError,
+    CassetteReplayError,
+    get_cassette,
+    use_cassette,
+)
+
+
+def record(path, calls):
+    """Record (kind, key, value) calls; a value that is an exception is raised."""
+
+    async def main(cassette):
+        for kind, key, value in calls:
+
+            async def fn(value=value):
+                if isinstance(value, Exception):
+                    raise value
+                return value
+
+            try:
+                await cassette.call(kind, key, fn)
+            except Exception:
+                pass
+
+    with use_cassette(path, RECORD) as cassette:
+        asyncio.run(main(cassette))
+
+
+def never_called():
+    raise AssertionError("upstream must not be called in replay mode")
+
+
+def test_replay_returns_recorded_responses(tmp_path):
+    """Replayed calls return what was recorded without calling upstream."""
+    path = tmp_path / "cassette.json"
+    record(path, [("llm", "a", "first"), ("llm", "a", "second"), ("search", "b", 1)])
+
+    async def main(cassette):
+        return [
+            await cassette.call("llm", "a", never_called),
+            await cassette.call("search", "b", never_called),
+            await cassette.call("llm", "a", never_called),
+            # Exhausted keys keep returning their last response
+            await cassette.call("llm", "a", never_called),
+        ]
+
+    with use_cassette(path, REPLAY) as cassette:
+        assert asyncio.run(main(cassette)) == ["first", 1, "second", "second"]
+    assert get_cassette() is None
+
+
+def test_replay_reraises_recorded_errors(tmp_path):
+    """Failed calls fail again on replay with the original error text."""
+    path = tmp_path / "cassette.json"
+    record(path, [("search", "q", RuntimeError("202 Ratelimit"))])
+
+    with use_cassette(path, REPLAY) as cassette:
+        with pytest.raises(CassetteReplayError, match="RuntimeError: 202 Ratelimit"):
+            asyncio.run(cassette.call("search", "q", never_called))
+
+
+def test_replay_of_unknown_request_fails(tmp_path):
+    """Requests that were never recorded are reported, not sent upstream."""
+    path = tmp_path / "cassette.json"
+    record(path, [])
+
+    with use_cassette(path, REPLAY) as cassette:
+        with pytest.raises(CassetteMissError):
+            asyncio.run(cassette.call("llm", "unknown", never_called))
+
+
+def test_replay_timing_uses_recorded_latency(tmp_path):
+    """With realtime replay, recorded latencies are slept (scaled by speed)."""
+    path = tmp_path / "cassette.json"
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    with use_cassette(path, RECORD) as cassette:
+        asyncio.run(cassette.call("llm", "a", slow))
+    assert cassette.interactions[0]["latency"] >= 0.05
+
+    async def timed(cassette):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await cassette.call("llm", "a", never_called)
+        return loop.time() - start
+
+    with use_cassette(path, REPLAY, realtime=True, speed=0.5) as cassette:
+        assert asyncio.run(timed(cassette)) >= 0.1
@@ -0,0 +1,243 @@
+"""Tests for the adaptive circuit breaker."""
+
+import asyncio
+
+import pytest
+
+from src.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    AdaptiveCircuitBreaker,
+    CircuitOpenError,
+    is_rate_limit_error,
+)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RatelimitException(Exception):
+    pass
+
+
+def make_breaker(clock, **kwargs):
+    return AdaptiveCircuitBreaker(clock=clock, **kwargs)
+
+
+def test_rate_limit_detection():
+    """Rate-limit errors are recognized by type name or message."""
+    assert is_rate_limit_error(RatelimitException("https://duckduckgo.com 202"))
+    assert is_rate_limit_error(RuntimeError("HTTP 429 Too Many Requests"))
+    assert not is_rate_limit_error(ValueError("no results"))
+
+
+def test_additive_increase_and_multiplicative_decrease():
+    """Fast successes grow the limit, failures halve it."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, initial_limit=2, max_limit=8, min_calls=100)
+
+    for _ in range(10):
+        assert asyncio.run(breaker.acquire()) is False
+        breaker.record_success(latency=0.1)
+    assert breaker.limit > 4
+
+    before = breaker.limit
+    asyncio.run(breaker.acquire())
+    breaker.record_failure(latency=0.1)
+    assert breaker.limit == pytest.approx(before / 2)
+    assert breaker.state == CLOSED
+
+
+def test_slow_calls_reduce_limit():
+    """Successful calls above the latency target shrink the limit."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, initial_limit=4, latency_target=1.0)
+
+    asyncio.run(breaker.acquire())
+    breaker.record_success(latency=5.0)
+    assert breaker.limit == pytest.approx(3.0)
+
+
+def test_rate_limit_opens_circuit_and_probe_recovers():
+    """A rate limit opens the circuit; a successful probe closes it."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, cooldown=5.0, max_wait=1.0)
+
+    async def rate_limited():
+        raise RatelimitException("202 Ratelimit")
+
+    with pytest.raises(RatelimitException):
+        asyncio.run(breaker.call(rate_limited))
+    assert breaker.state == OPEN
+
+    # Cooldown is longer than we are willing to wait, so fail fast
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.acquire())
+    assert breaker.metrics()["rejected"] == 1
+
+    clock.now = 6.0
+    assert asyncio.run(breaker.acquire()) is True
+    assert breaker.state == HALF_OPEN
+    breaker.record_success(latency=0.1, is_probe=True)
+    assert breaker.state == CLOSED
+    assert breaker.limit == breaker.min_limit
+
+
+def test_failed_probe_doubles_cooldown():
+    """A failed probe reopens the circuit with a longer cooldown."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, cooldown=5.0)
+
+    asyncio.run(breaker.acquire())
+    breaker.record_failure(latency=0.1, rate_limited=True)
+    clock.now = 6.0
+    assert asyncio.run(breaker.acquire()) is True
+    breaker.record_failure(latency=0.1, is_probe=True, rate_limited=True)
+
+    assert breaker.state == OPEN
+    assert breaker.cooldown == 10.0
+    assert breaker.metrics()["opens"] == 2
+
+
+def test_high_failure_rate_opens_circuit():
+    """Generic failures open the circuit once the failure rate is too high."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, initial_limit=8, min_calls=4, failure_threshold=0.5)
+
+    for success in (True, True, False):
+        asyncio.run(breaker.acquire())
+        if success:
+            breaker.record_success(latency=0.1)
+        else:
+            breaker.record_failure(latency=0.1)
+    assert breaker.state == CLOSED
+
+    asyncio.run(breaker.acquire())
+    breaker.record_failure(latency=0.1)
+    assert breaker.state == OPEN
+
+
+def test_concurrency_is_limited():
+    """No more calls than the current limit run at the same time."""
+    breaker = AdaptiveCircuitBreaker(initial_limit=2, max_limit=2)
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(breaker.call(work) for _ in range(6)))
+
+    assert asyncio.run(main()) == ["ok"] * 6
+    assert peak == 2
+    assert breaker.in_flight == 0
+
+
+def test_waiters_wake_when_cooldown_ends():
+    """Callers blocked by an open circuit are let through once it cools down."""
+    breaker = AdaptiveCircuitBreaker(cooldown=0.05, max_wait=1.0)
+
+    async def main():
+        await breaker.acquire()
+        breaker.record_failure(latency=0.1, rate_limited=True)
+        assert breaker.state == OPEN
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        is_probe = await breaker.acquire()
+        return is_probe, loop.time() - start
+
+    is_probe, waited = asyncio.run(main())
+    assert is_probe is True
+    assert 0.04 <= waited < 0.5
+
+
+def test_waiters_block_without_polling_until_release():
+    """A caller waiting for a slot sleeps until another call releases one."""
+    breaker = AdaptiveCircuitBreaker(initial_limit=1, max_limit=1)
+
+    async def main():
+        await breaker.acquire()
+        waiting = asyncio.ensure_future(breaker.acquire())
+        await asyncio.sleep(0.02)
+        assert not waiting.done()
+        assert len(breaker._waiters) == 1
+        breaker.record_success(latency=0.1)
+        assert await asyncio.wait_for(waiting, 1) is False
+
+    asyncio.run(main())
+    assert breaker.in_flight == 1
+
+
+def test_set_max_limit_caps_concurrency():
+    """Lowering the maximum also lowers the current limit."""
+    breaker = AdaptiveCircuitBreaker(initial_limit=4, max_limit=8)
+    breaker.set_max_limit(2)
+    assert breaker.limit == 2
+    assert breaker.metrics()["concurrency_limit"] == 2
+
+
+def test_limit_decreases_once_per_round_of_calls():
+    """Calls completing together shrink the limit once, not once per call."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, initial_limit=8, max_limit=8, latency_target=1.0)
+
+    for _ in range(8):
+        asyncio.run(breaker.acquire())
+    clock.now = 2.0
+    for _ in range(8):
+        breaker.record_success(latency=2.0)
+    assert breaker.limit == pytest.approx(6.0)
+
+    # Failures of calls started after the decrease shrink it again, once
+    for _ in range(3):
+        asyncio.run(breaker.acquire())
+    clock.now = 3.0
+    for _ in range(3):
+        breaker.record_failure(latency=0.5)
+    assert breaker.limit == pytest.approx(3.0)
+    assert breaker.state == CLOSED
+
+
+def test_cancelled_caller_keeps_slot_until_work_finishes():
+    """Work that outlives its cancelled caller still counts against the limit."""
+    breaker = AdaptiveCircuitBreaker(initial_limit=1, max_limit=1)
+    release = None
+
+    async def work():
+        # Like a thread, this work is not stopped by cancelling the caller
+        await asyncio.shield(release)
+        return "ok"
+
+    async def main():
+        nonlocal release
+        release = asyncio.get_running_loop().create_future()
+        caller = asyncio.ensure_future(breaker.call(work))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0)
+        assert caller.cancelled()
+        assert breaker.in_flight == 1
+
+        waiting = asyncio.ensure_future(breaker.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        release.set_result(None)
+        assert await asyncio.wait_for(waiting, 1) is False
+
+    asyncio.run(main())
+    assert breaker.successes == 1
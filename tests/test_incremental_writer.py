@@ -0,0 +1,215 @@
+"""Tests for drafting report sections while searches are still running."""
+
+import asyncio
+
+import pytest
+
+from src.agents import research_manager as research_manager_module
+from src.agents.events import (
+    FinalReport,
+    PartialReport,
+    SearchCompleted,
+    StageFinished,
+    StageStarted,
+)
+from src.agents.planning_agent import WebSearchItem, WebSearchPlan
+from src.agents.research_manager import ResearchManager
+from src.agents.writer_agent import ReportSection, ReportSummary
+
+
+def make_plan(*queries):
+    return WebSearchPlan(
+        searches=[WebSearchItem(reason="reason", query=query) for query in queries]
+    )
+
+
+class FakeSectionWriter:
+    """Section writer recording its prompts, optionally slow or failing."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.prompts = []
+        self.cancelled = 0
+
+    async def ainvoke(self, inputs):
+        prompt = inputs["messages"][-1][1]
+        self.prompts.append(prompt)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError("writer unavailable")
+        title = f"Section {len(self.prompts)}"
+        return {"structured_response": ReportSection(title=title, markdown=prompt)}
+
+
+class FakeSummaryWriter:
+    async def ainvoke(self, inputs):
+        summary = ReportSummary(
+            title="Report title",
+            executive_summary="The summary",
+            key_insights=["First insight", "Second insight"],
+            conclusion="The conclusion",
+        )
+        return {"structured_response": summary}
+
+
+@pytest.fixture
+def writers(monkeypatch):
+    def install(section_writer):
+        monkeypatch.setattr(
+            research_manager_module, "section_writer_agent", section_writer
+        )
+        monkeypatch.setattr(
+            research_manager_module, "summary_writer_agent", FakeSummaryWriter()
+        )
+        return section_writer
+
+    return install
+
+
+def fake_search_with_delays(delays):
+    async def fake_search(self, item, on_start=None):
+        if on_start is not None:
+            on_start()
+        await asyncio.sleep(delays.get(item.query, 0))
+        if item.query.startswith("fail"):
+            return None
+        return f"summary of {item.query}"
+
+    return fake_search
+
+
+async def collect(agen):
+    return [event async for event in agen]
+
+
+def run_draft(manager, queries):
+    return asyncio.run(
+        collect(manager.search_and_draft("the query", make_plan(*queries)))
+    )
+
+
+def test_batches_follow_plan_order(monkeypatch, writers):
+    """Batches hold the same searches in plan order however they complete."""
+    queries = ["a", "b", "c", "d", "e"]
+    section_writer = writers(FakeSectionWriter())
+    manager = ResearchManager(incremental_writer=True, writer_batch_size=2)
+
+    # Later searches finish first
+    delays = {query: 0.01 * (len(queries) - i) for i, query in enumerate(queries)}
+    monkeypatch.setattr(ResearchManager, "search", fake_search_with_delays(delays))
+    run_draft(manager, queries)
+    reversed_prompts = sorted(section_writer.prompts)
+
+    section_writer.prompts.clear()
+    delays = {query: 0.01 * i for i, query in enumerate(queries)}
+    monkeypatch.setattr(ResearchManager, "search", fake_search_with_delays(delays))
+    run_draft(manager, queries)
+
+    assert sorted(section_writer.prompts) == reversed_prompts
+    assert len(reversed_prompts) == 3
+    first_batch = next(p for p in reversed_prompts if "### a" in p)
+    assert "### b" in first_batch
+    assert first_batch.index("### a") < first_batch.index("### b")
+
+
+def test_sections_stream_and_assemble_final_report(monkeypatch, writers):
+    """Drafted sections show up as partial reports and in the final report."""
+    writers(FakeSectionWriter())
+    monkeypatch.setattr(
+        ResearchManager, "search", fake_search_with_delays({"c": 0.02, "d": 0.02})
+    )
+    manager = ResearchManager(incremental_writer=True, writer_batch_size=2)
+
+    events = run_draft(manager, ["a", "b", "c", "d"])
+
+    partials = [e for e in events if isinstance(e, PartialReport)]
+    assert partials
+    # The first section is shown before all searches are done
+    first_partial = events.index(partials[0])
+    last_search = max(i for i, e in enumerate(events) if isinstance(e, SearchCompleted))
+    assert first_partial < last_search
+    assert partials[-1].markdown.count("## Section") == 2
+
+    final = events[-1]
+    assert isinstance(final, FinalReport)
+    assert not final.failed
+    markdown = final.report.markdown_report
+    assert markdown.startswith("# Report title")
+    for heading in ("## Executive Summary", "## Key Insights", "## Conclusion"):
+        assert heading in markdown
+    assert markdown.index("## Executive Summary") < markdown.index("## Section")
+    assert markdown.index("## Section") < markdown.index("## Key Insights")
+    assert "- First insight\n- Second insight" in markdown
+    assert markdown.endswith("The conclusion")
+    assert final.report.key_insights == ["First insight", "Second insight"]
+
+
+def test_failed_section_falls_back_to_findings(monkeypatch, writers):
+    """A failing section writer keeps the raw search results."""
+    writers(FakeSectionWriter(fail=True))
+    monkeypatch.setattr(ResearchManager, "search", fake_search_with_delays({}))
+    manager = ResearchManager(incremental_writer=True, writer_batch_size=3)
+
+    events = run_draft(manager, ["a", "fail b", "c"])
+
+    markdown = events[-1].report.markdown_report
+    assert "## Additional Findings\n\nsummary of a\n\nsummary of c" in markdown
+
+
+def test_stage_events_pair_up(monkeypatch, writers):
+    """Every stage that starts also finishes, each exactly once."""
+    writers(FakeSectionWriter(delay=0.02))
+    monkeypatch.setattr(ResearchManager, "search", fake_search_with_delays({}))
+    manager = ResearchManager(incremental_writer=True, writer_batch_size=2)
+
+    async def fake_plan(self, query):
+        return make_plan("a", "b", "c")
+
+    monkeypatch.setattr(ResearchManager, "plan_searches", fake_plan)
+
+    events = asyncio.run(collect(manager.run("the query")))
+    started = [e.stage for e in events if isinstance(e, StageStarted)]
+    finished = [e.stage for e in events if isinstance(e, StageFinished)]
+    assert started == ["planning", "searching", "drafting", "writing"]
+    assert finished == started
+
+
+def test_no_results_fails_without_writing(monkeypatch, writers):
+    """Without any search results no section or summary is written."""
+    section_writer = writers(FakeSectionWriter())
+    monkeypatch.setattr(ResearchManager, "search", fake_search_with_delays({}))
+    manager = ResearchManager(incremental_writer=True, writer_batch_size=2)
+
+    events = run_draft(manager, ["fail a", "fail b"])
+
+    assert section_writer.prompts == []
+    assert isinstance(events[-1], FinalReport)
+    assert events[-1].failed
+    assert not any(isinstance(e, StageStarted) for e in events)
+
+
+def test_stopping_early_cancels_drafts(monkeypatch, writers):
+    """Closing the event stream cancels sections still being drafted."""
+    section_writer = writers(FakeSectionWriter(delay=10))
+    monkeypatch.setattr(ResearchManager, "search", fake_search_with_delays({}))
+    manager = ResearchManager(incremental_writer=True, writer_batch_size=1)
+
+    async def main():
+        events = manager.search_and_draft("the query", make_plan("a", "b"))
+        async for event in events:
+            if isinstance(event, StageStarted) and event.stage == "drafting":
+                break
+        # Let both drafts start before stopping
+        await asyncio.sleep(0)
+        await events.aclose()
+        # Let the cancellations run
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert len(section_writer.prompts) == 2
+    assert section_writer.cancelled == 2
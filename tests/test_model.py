@@ -0,0 +1,34 @@
+"""Tests for the coalescing Gemini chat model."""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from src.model.model import gemini_llm, llm_flight
+
+
+def test_coalesced_callers_get_their_own_messages(monkeypatch):
+    """Identical concurrent prompts hit the API once but share no objects."""
+    upstream_calls = 0
+
+    async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.01)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="hi"))])
+
+    monkeypatch.setattr(ChatGoogleGenerativeAI, "_agenerate", fake_agenerate)
+    coalesced_before = llm_flight.coalesced
+
+    async def main():
+        prompt = [HumanMessage(content="the same prompt")]
+        return await asyncio.gather(*(gemini_llm.ainvoke(prompt) for _ in range(3)))
+
+    messages = asyncio.run(main())
+    assert upstream_calls == 1
+    assert llm_flight.coalesced - coalesced_before == 2
+    assert [message.content for message in messages] == ["hi"] * 3
+    assert len({id(message) for message in messages}) == 3
+    assert len({message.id for message in messages}) == 3
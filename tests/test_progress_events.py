@@ -0,0 +1,153 @@
+"""Tests for the progress events of a research run and their rendering."""
+
+import asyncio
+
+from app import ProgressView
+from src.agents.events import (
+    FinalReport,
+    PartialReport,
+    SearchCompleted,
+    SearchStarted,
+    StageFinished,
+    StageStarted,
+)
+from src.agents.planning_agent import WebSearchItem, WebSearchPlan
+from src.agents.research_manager import ResearchManager
+from src.agents.writer_agent import ReportData
+
+# Per-query delays make searches finish in a different order than planned
+DELAYS = {"slow": 0.03, "fail": 0.01, "fast": 0.0}
+
+
+def make_plan(*queries):
+    return WebSearchPlan(
+        searches=[WebSearchItem(reason="reason", query=query) for query in queries]
+    )
+
+
+async def fake_search(self, item, on_start=None):
+    if on_start is not None:
+        on_start()
+    await asyncio.sleep(DELAYS.get(item.query, 0))
+    if item.query == "fail":
+        return None
+    return f"summary of {item.query}"
+
+
+async def collect(agen):
+    return [event async for event in agen]
+
+
+def test_iter_searches_events(monkeypatch):
+    """Each search starts before it completes and the counter counts up."""
+    monkeypatch.setattr(ResearchManager, "search", fake_search)
+    plan = make_plan("slow", "fail", "fast")
+
+    events = asyncio.run(collect(ResearchManager().iter_searches(plan)))
+
+    started = [e for e in events if isinstance(e, SearchStarted)]
+    completed = [e for e in events if isinstance(e, SearchCompleted)]
+    assert sorted(e.index for e in started) == [0, 1, 2]
+    assert [e.completed for e in completed] == [1, 2, 3]
+    assert [e.query for e in completed] == ["fast", "fail", "slow"]
+    assert all(e.total == 3 for e in started + completed)
+    for event in completed:
+        started_at = events.index(next(e for e in started if e.index == event.index))
+        assert started_at < events.index(event)
+
+    summaries = {e.query: e.summary for e in completed}
+    assert summaries == {
+        "slow": "summary of slow",
+        "fail": None,
+        "fast": "summary of fast",
+    }
+
+
+def test_iter_searches_cancels_searches_when_consumer_stops(monkeypatch):
+    """Closing the event stream early cancels the searches still running."""
+    cancelled = []
+
+    async def hanging_search(self, item, on_start=None):
+        if item.query == "fast":
+            return "summary"
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(item.query)
+            raise
+
+    monkeypatch.setattr(ResearchManager, "search", hanging_search)
+
+    async def main():
+        events = ResearchManager().iter_searches(make_plan("fast", "a", "b"))
+        async for event in events:
+            if isinstance(event, SearchCompleted):
+                break
+        await events.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert sorted(cancelled) == ["a", "b"]
+
+
+def test_progress_view_render():
+    """Events map to status, results visibility and report outputs."""
+    view = ProgressView()
+
+    status, *_ = view.render(StageStarted(stage="searching", message="Searching..."))
+    assert status == "Searching..."
+
+    assert view.render(SearchStarted(index=0, total=2, query="q1"))[0].endswith(
+        "1/2 started"
+    )
+
+    status, results, _, _, report = view.render(
+        SearchCompleted(index=0, total=2, completed=1, query="q1", summary="s1")
+    )
+    assert "1/2 completed, 0 running" in status
+    assert results["visible"] is True
+    assert "### q1\ns1" in report
+
+    # A failed search updates the counter but not the report
+    _, _, _, _, report = view.render(
+        SearchCompleted(index=1, total=2, completed=2, query="q2", summary=None)
+    )
+    assert report == {"__type__": "update"}
+
+    # Once a draft is shown, raw findings no longer replace it
+    assert view.render(PartialReport(markdown="draft"))[4] == "draft"
+    view.render(
+        SearchCompleted(index=2, total=3, completed=3, query="q3", summary="s3")
+    )
+    assert view.findings[-1].query == "q1"
+
+    # The search counter is folded into the stage message when searching ends
+    view.render(StageFinished(stage="searching", message="Searches complete"))
+    assert "🔎" not in view.status()
+
+    status, results, summary, insights, report = view.render(
+        FinalReport(
+            report=ReportData(
+                markdown_report="# Report", executive_summary="sum", key_insights=["a"]
+            )
+        )
+    )
+    assert status.endswith("✅ Research completed successfully!")
+    assert (summary, insights, report) == ("sum", "• a", "# Report")
+
+
+def test_progress_view_shows_failed_report():
+    """A report explaining that no search succeeded is shown as a failure."""
+    view = ProgressView()
+    status, *_ = view.render(
+        FinalReport(
+            report=ReportData(
+                markdown_report="No search results",
+                executive_summary="",
+                key_insights=[],
+            ),
+            failed=True,
+        )
+    )
+    assert "❌" in status
+    assert "✅" not in status
@@ -0,0 +1,110 @@
+"""End-to-end test recording and replaying a research run."""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from langchain_community.tools import DuckDuckGoSearchRun
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from src.agents.events import FinalReport, SearchCompleted
+from src.agents.research_manager import ResearchManager
+from src.utils.cassette import RECORD, REPLAY, use_cassette
+
+NUM_SEARCHES = 4
+
+
+class FakeUpstreams:
+    """Fake Gemini and DuckDuckGo that fail if called while replaying."""
+
+    def __init__(self):
+        self.replaying = False
+
+    async def agenerate(self, model, messages, stop=None, run_manager=None, **kwargs):
+        assert not self.replaying, "Gemini called during replay"
+        tools = str(kwargs.get("tools"))
+
+        def tool_call(name, args):
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": name, "args": args, "id": str(uuid.uuid4())}],
+            )
+
+        if "WebSearchPlan" in tools:
+            searches = [
+                {"reason": "reason", "query": f"query {i}"} for i in range(NUM_SEARCHES)
+            ]
+            message = tool_call("WebSearchPlan", {"searches": searches})
+        elif "ReportData" in tools:
+            # The report echoes its prompt, so a different prompt is visible
+            prompt = messages[-1].content
+            message = tool_call(
+                "ReportData",
+                {
+                    "markdown_report": prompt,
+                    "executive_summary": "summary",
+                    "key_insights": ["insight"],
+                },
+            )
+        elif "duckduckgo" in tools and not any(
+            isinstance(m, ToolMessage) for m in messages
+        ):
+            term = messages[-1].content.split("\n")[0].removeprefix("Search term: ")
+            message = tool_call("duckduckgo_search", {"query": term})
+        else:
+            message = AIMessage(content=f"summary {uuid.uuid4()}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def search(self, tool, query, run_manager=None):
+        assert not self.replaying, "DuckDuckGo called during replay"
+        # Later searches finish first, so completion order differs from replay
+        time.sleep(0.02 * (NUM_SEARCHES - int(query.split()[-1])))
+        return f"results for {query}"
+
+
+@pytest.fixture
+def upstreams(monkeypatch):
+    fake = FakeUpstreams()
+    monkeypatch.setattr(
+        ChatGoogleGenerativeAI,
+        "_agenerate",
+        lambda self, *args, **kwargs: fake.agenerate(self, *args, **kwargs),
+    )
+    monkeypatch.setattr(
+        DuckDuckGoSearchRun,
+        "_run",
+        lambda self, *args, **kwargs: fake.search(self, *args, **kwargs),
+    )
+    return fake
+
+
+def run_research() -> tuple[list[str], FinalReport]:
+    async def main():
+        events = [
+            event
+            async for event in ResearchManager(incremental_writer=False).run("topic")
+        ]
+        order = [e.query for e in events if isinstance(e, SearchCompleted)]
+        return order, events[-1]
+
+    return asyncio.run(main())
+
+
+def test_replay_reproduces_recorded_run(tmp_path, upstreams):
+    """A recorded run replays offline to the same report, in any search order."""
+    path = tmp_path / "run.cassette.json"
+
+    with use_cassette(path, RECORD):
+        recorded_order, recorded = run_research()
+    assert recorded_order[0] == f"query {NUM_SEARCHES - 1}"
+
+    upstreams.replaying = True
+    with use_cassette(path, REPLAY):
+        _, replayed = run_research()
+
+    assert isinstance(replayed, FinalReport)
+    assert not replayed.failed
+    assert replayed.report == recorded.report
@@ -0,0 +1,62 @@
+"""Tests for sharing search summaries between research runs."""
+
+import asyncio
+
+from src.agents.planning_agent import WebSearchItem
+from src.agents.research_manager import ResearchManager
+
+
+def fake_search_agent(calls):
+    async def run_search_agent(self, item):
+        calls.append(item)
+        await asyncio.sleep(0.01)
+        return f"summary for {item.reason}"
+
+    return run_search_agent
+
+
+def test_concurrent_searches_with_different_reasons_are_not_shared(monkeypatch):
+    """Each reason gets its own summary, identical requests share one."""
+    calls = []
+    monkeypatch.setattr(ResearchManager, "_run_search_agent", fake_search_agent(calls))
+    manager = ResearchManager()
+    pricing = WebSearchItem(query="Acme pricing", reason="competitor pricing tiers")
+    same_pricing = WebSearchItem(
+        query="acme  PRICING", reason="Competitor pricing tiers"
+    )
+    lawsuit = WebSearchItem(query="acme  PRICING", reason="lawsuit over price fixing")
+
+    async def main():
+        return await asyncio.gather(
+            manager.search(pricing),
+            manager.search(same_pricing),
+            manager.search(lawsuit),
+        )
+
+    results = asyncio.run(main())
+    assert results == [
+        "summary for competitor pricing tiers",
+        "summary for competitor pricing tiers",
+        "summary for lawsuit over price fixing",
+    ]
+    assert len(calls) == 2
+
+
+def test_cached_summary_is_only_reused_for_the_same_reason(monkeypatch):
+    """A later search for the same term and another reason is not served from cache."""
+    calls = []
+    monkeypatch.setattr(ResearchManager, "_run_search_agent", fake_search_agent(calls))
+    manager = ResearchManager(search_cache_size=10)
+    pricing = WebSearchItem(query="Acme pricing", reason="competitor pricing tiers")
+    lawsuit = WebSearchItem(query="acme  PRICING", reason="lawsuit over price fixing")
+
+    assert (
+        asyncio.run(manager.search(pricing)) == "summary for competitor pricing tiers"
+    )
+    assert (
+        asyncio.run(manager.search(lawsuit)) == "summary for lawsuit over price fixing"
+    )
+    assert (
+        asyncio.run(manager.search(pricing)) == "summary for competitor pricing tiers"
+    )
+    assert len(calls) == 2
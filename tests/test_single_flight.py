@@ -0,0 +1,112 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import SingleFlight, normalize_key
+
+
+def test_normalize_key():
+    """Case and whitespace differences map to the same key."""
+    assert normalize_key("  AI in   Healthcare ") == normalize_key("ai in healthcare")
+
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    """Callers with the same key get the result of a single call."""
+    flight = SingleFlight()
+    upstream_calls = 0
+
+    async def fetch():
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert upstream_calls == 1
+    assert flight.metrics() == {"in_flight": 0, "calls": 1, "coalesced": 4}
+
+
+def test_different_keys_and_sequential_calls_are_not_coalesced():
+    """Only calls overlapping in time with the same key are shared."""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0)
+        return "result"
+
+    async def main():
+        await asyncio.gather(flight.do("a", fetch), flight.do("b", fetch))
+        await flight.do("a", fetch)
+
+    asyncio.run(main())
+    assert flight.metrics()["calls"] == 3
+    assert flight.metrics()["coalesced"] == 0
+
+
+def test_errors_are_shared():
+    """Every waiting caller sees the upstream error."""
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def main():
+        return await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    """Cancelling one waiter leaves the shared call running for the rest."""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "result"
+
+
+def test_shared_call_is_cancelled_when_every_caller_leaves():
+    """Once the last waiting caller is cancelled the upstream call stops too."""
+    flight = SingleFlight()
+    upstream_cancelled = asyncio.Event()
+
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            upstream_cancelled.set()
+            raise
+
+    async def main():
+        callers = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        assert not upstream_cancelled.is_set()
+        callers[1].cancel()
+        await asyncio.wait_for(upstream_cancelled.wait(), 1)
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert "key" not in flight
+
+    asyncio.run(main())